@@ -56,12 +56,17 @@ def get_ctx() -> Context:
     return Context.from_json(ctx_data.read_text())
 
 
-def save_ctx(context: Context) -> None:
-    ctx_json = get_ctx_dir() / _CTX_METADATA
+def save_ctx(context: Context) -> str:
+    ctx_dir = get_ctx_dir()
+
+    ctx_json = ctx_dir / _CTX_METADATA
     ctx_json.write_text(context.to_json())
 
-    ctx_md = get_ctx_dir() / _CTX_OUTPUT
-    ctx_md.write_text(context.generate())
+    output = context.generate()
+    ctx_md = ctx_dir / _CTX_OUTPUT
+    ctx_md.write_text(output)
+
+    return output
 
 
 def init_ctx(root: Path) -> None:
@@ -211,9 +216,7 @@ def tree() -> None:
 @cli.command()
 def generate() -> None:
     """Generate the context output."""
-    ctx = get_ctx()
-    save_ctx(ctx)
-    click.echo(ctx.generate())
+    click.echo(save_ctx(get_ctx()))
 
 
 if __name__ == "__main__":
@@ -3,33 +3,66 @@ from __future__ import annotations
 import json
 import logging
 import os
+import queue
+import re
+import stat
+import threading
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
 
-import pathspec
+if t.TYPE_CHECKING:
+    import pathspec
 
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _resolve_cached(path: str) -> str:
+    """Resolve an absolute path, following symlinks.
+
+    On POSIX, the parent is resolved through the cache too, so files sharing a
+    directory only cost an lstat of their own; realpath is only called for
+    components that are symlinks, `.` or `..`, the latter only making sense once
+    the symlinks before them are resolved.
+    """
+    head, tail = os.path.split(path)
+    if os.name != "posix" or tail in ("", ".", ".."):
+        return os.path.realpath(path)
+
+    candidate = os.path.join(_resolve_cached(head), tail)
+    if os.path.islink(candidate):
+        return os.path.realpath(candidate)
+    return candidate
+
+
 class Context:
     def __init__(
         self,
         root_path: Path,
         ignore: t.Optional[str | Path | t.List[str | Path]] = None,
+        threads: int = 1,
     ):
         self.root_path = root_path.resolve()
         self.ignore = ignore
-        self._ignore_patterns = self._load_ignore_patterns(ignore) if ignore else None
-        self._included: set[Path] = set()
-        logger.debug(f"Initialized Context with root path: {self.root_path}")
+        self.threads = threads
+        self._included: set[str] = set()
+        self._sorted_included: t.Optional[t.List[str]] = None
+        self._root_str = str(self.root_path).rstrip(os.sep) + os.sep
+        self._root_len = len(self._root_str)
+        logger.debug("Initialized Context with root path: %s", self.root_path)
 
     @staticmethod
     def _load_ignore_patterns(
         ignore: str | Path | t.List[str | Path],
     ) -> pathspec.PathSpec:
         """Load ignore patterns."""
-        lines = []
+        # Imported here so contexts without ignore patterns never pay for it.
+        import pathspec
+
+        lines: t.List[str] = []
 
         if not isinstance(ignore, list):
             ignore = [ignore]
@@ -38,17 +71,369 @@ class Context:
             if isinstance(i, str):
                 lines.extend(i.splitlines())
             elif isinstance(i, Path):
-                if i.exists() and i.is_file():
-                    lines.extend(i.read_text().splitlines())
+                if os.path.isfile(i):
+                    lines.extend(i.read_bytes().decode().splitlines())
+
+        # Blank lines and comments never match; skip building patterns for them.
+        lines = [line for line in lines if line.strip() and line[0] != "#"]
 
         return pathspec.PathSpec.from_lines("gitwildmatch", lines)
 
-    def _is_ignored(self, path: Path) -> bool:
-        """Check if a path matches any ignore patterns."""
-        if self._ignore_patterns:
-            relative_path = path.relative_to(self.root_path)
-            return self._ignore_patterns.match_file(str(relative_path))
-        return False
+    @cached_property
+    def _compiled_ignore(self) -> t.Optional[pathspec.PathSpec]:
+        """Ignore patterns, compiled on first use. None if nothing is ignored."""
+        if not self.ignore:
+            return None
+
+        spec = self._load_ignore_patterns(self.ignore)
+        if not any(pattern.include is not None for pattern in spec.patterns):
+            return None
+        return spec
+
+    @cached_property
+    def _ignore_re(self) -> t.Optional[re.Pattern[str]]:
+        """Non-negated ignore patterns combined into a single regular expression.
+
+        None when the patterns cannot be combined, e.g. when a negated pattern is
+        followed by a non-negated one: the result then depends on the order in
+        which the patterns are evaluated. Also None when either the non-negated or
+        the negated patterns fail to compile as one regex.
+        """
+        regexes = self._ignore_regexes
+        if not regexes or (regexes[1] and self._negative_re is None):
+            return None
+        return self._combine_regexes(regexes[0])
+
+    @cached_property
+    def _negative_re(self) -> t.Optional[re.Pattern[str]]:
+        """Negated ignore patterns combined into a single regular expression.
+
+        None when there are none, but also when they cannot be combined; only
+        read it once `_ignore_re` is known not to be None.
+        """
+        regexes = self._ignore_regexes
+        if not regexes or not regexes[1]:
+            return None
+        return self._combine_regexes(regexes[1])
+
+    @cached_property
+    def _ignore_regexes(self) -> t.Optional[t.Tuple[t.List[str], t.List[str]]]:
+        """Regexes of the non-negated and negated ignore patterns.
+
+        Only available when all negated patterns come after the non-negated ones.
+        In that case the last matching pattern is a negated one iff any negated
+        pattern matches, so a path is ignored iff a non-negated pattern matches
+        and no negated one does.
+        """
+        if self._compiled_ignore is None:
+            return None
+
+        # "gitwildmatch" patterns are all regex patterns.
+        patterns = t.cast(
+            "t.Collection[pathspec.RegexPattern]", self._compiled_ignore.patterns
+        )
+        positive: t.List[str] = []
+        negative: t.List[str] = []
+        for pattern in patterns:
+            if pattern.include is None:
+                continue
+            if pattern.include and negative:
+                return None
+            # Named groups cannot be repeated across an alternation.
+            regex = re.sub(r"\(\?P<\w+>", "(?:", pattern.regex.pattern)
+            (positive if pattern.include else negative).append(regex)
+
+        return positive, negative
+
+    @cached_property
+    def _ignore_match(self) -> t.Callable[[str], bool]:
+        """Predicate telling if a relative POSIX path is ignored.
+
+        Without negated patterns, paths with an extension ignored by a `*.ext`
+        pattern are answered without running any regex. When the patterns cannot
+        be combined, they are tried one by one from the last, the first match
+        deciding.
+        """
+        spec = self._compiled_ignore
+        if spec is None:
+            return lambda path: False
+
+        positive = self._ignore_re
+        if positive is None:
+            return self._ordered_ignore_match(spec)
+
+        negative = self._negative_re
+        if negative is not None:
+            return lambda path: (
+                positive.match(path) is not None and negative.match(path) is None
+            )
+
+        def match_regex(path: str) -> bool:
+            return positive.match(path) is not None
+
+        exts = self._ignore_exts
+        if not exts:
+            return match_regex
+
+        def match_ext(path: str) -> bool:
+            _, dot, ext = path.rpartition(".")
+            if dot and ext in exts:
+                return True
+            return match_regex(path)
+
+        return match_ext
+
+    @staticmethod
+    def _ordered_ignore_match(spec: pathspec.PathSpec) -> t.Callable[[str], bool]:
+        """Predicate applying the ignore patterns in order, the last match winning."""
+        patterns = t.cast("t.List[pathspec.RegexPattern]", list(spec.patterns))
+        ordered_rules = tuple(
+            (pattern.regex, pattern.include)
+            for pattern in reversed(patterns)
+            if pattern.include is not None
+        )
+
+        def match(path: str) -> bool:
+            for regex, include in ordered_rules:
+                if regex.match(path) is not None:
+                    return include
+            return False
+
+        return match
+
+    @cached_property
+    def _ignore_exts(self) -> t.FrozenSet[str]:
+        """Extensions ignored by plain `*.ext` patterns.
+
+        A path ending in one of them is ignored as long as no negated pattern can
+        include it again; the combined regex still covers these patterns.
+        """
+        if self._compiled_ignore is None:
+            return frozenset()
+
+        exts = set()
+        for pattern in self._compiled_ignore.patterns:
+            line = getattr(pattern, "pattern", None)
+            if not pattern.include or not isinstance(line, str):
+                continue
+            line = line.strip()
+            if line.startswith("*.") and not any(c in line[2:] for c in "*?[]\\/."):
+                exts.add(line[2:])
+        exts.discard("")
+        return frozenset(exts)
+
+    @staticmethod
+    def _combine_regexes(regexes: t.List[str]) -> t.Optional[re.Pattern[str]]:
+        if not regexes:
+            return re.compile("(?!)")  # never matches
+
+        try:
+            return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+        except re.error:
+            return None
+
+    @staticmethod
+    def _to_posix(path: str) -> str:
+        return path if os.sep == "/" else path.replace(os.sep, "/")
+
+    def _is_ignored(self, path: str) -> bool:
+        """Check if a path under the root path matches any ignore patterns."""
+        if self._compiled_ignore is None:
+            return False
+
+        root_len = self._root_len
+        return self._ignore_match(self._to_posix(path[root_len:]))
+
+    def _filter_ignored(self, paths: t.List[str]) -> t.List[str]:
+        """Filter out the paths, all under the root path, matching ignore patterns."""
+        if self._compiled_ignore is None:
+            return paths
+
+        root_len = self._root_len
+        relative_paths = [path[root_len:] for path in paths]
+        if os.sep != "/":
+            relative_paths = [path.replace(os.sep, "/") for path in relative_paths]
+
+        match = self._ignore_match
+        kept = [
+            path
+            for path, relative_path in zip(paths, relative_paths)
+            if not match(relative_path)
+        ]
+
+        logger.debug("Ignored paths: %d", len(paths) - len(kept))
+        return kept
+
+    def _is_ignored_dir(self, path: str) -> bool:
+        """Check if a directory under the root path and all its contents are ignored.
+
+        Only answered from the combined regex: with negated patterns, files inside
+        an ignored directory may still be included again.
+        """
+        if self._ignore_re is None:
+            return False
+        root_len = self._root_len
+        relative_path = self._to_posix(path[root_len:])
+
+        names, paths = self._ignore_dirs
+        if relative_path in paths or relative_path.rpartition("/")[2] in names:
+            return True
+        return self._ignore_re.match(relative_path + "/") is not None
+
+    @cached_property
+    def _ignore_dirs(self) -> t.Tuple[t.FrozenSet[str], t.FrozenSet[str]]:
+        """Directory names and relative paths ignored by patterns without wildcards.
+
+        Checked before the combined regex. Like it, they may only be used to
+        prune directories when no negated pattern can include their files again.
+        """
+        names: t.Set[str] = set()
+        paths: t.Set[str] = set()
+        spec = self._compiled_ignore
+        if spec is None or self._ignore_re is None or self._negative_re is not None:
+            return frozenset(names), frozenset(paths)
+
+        for pattern in spec.patterns:
+            line = getattr(pattern, "pattern", None)
+            if not pattern.include or not isinstance(line, str):
+                continue
+            line = line.strip().rstrip("/")
+            if not line or any(c in line for c in "*?[]\\") or "//" in line:
+                continue
+            if "/" in line:
+                # A slash other than a trailing one anchors the pattern to the root.
+                paths.add(line.lstrip("/"))
+            elif line not in (".", ".."):
+                names.add(line)
+        paths.discard("")
+        return frozenset(names), frozenset(paths)
+
+    @staticmethod
+    def _scandir_recursive(
+        paths: t.Sequence[str],
+        prune: t.Optional[t.Callable[[str], bool]] = None,
+    ) -> t.List[str]:
+        """Recursively list the files under directories, skipping symlinks.
+
+        Directories for which `prune` returns True are not descended into.
+        """
+        files: t.List[str] = []
+        append = files.append
+        stack = list(reversed(paths))
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        # Symlinks are neither, so they are skipped.
+                        if entry.is_file(follow_symlinks=False):
+                            append(entry.path)
+                        elif entry.is_dir(follow_symlinks=False):
+                            if prune is not None and prune(entry.path):
+                                logger.debug("Ignored directory: %s", entry.path)
+                                continue
+                            stack.append(entry.path)
+            except OSError as e:
+                logger.error("Could not read: %s: %s", current, e)
+        return files
+
+    @staticmethod
+    def _parallel_walk(
+        tops: t.Sequence[str],
+        threads: int = 16,
+        prune: t.Optional[t.Callable[[str], bool]] = None,
+    ) -> t.List[str]:
+        """List the files under directories, scanning them with a thread pool.
+
+        Keeps several scandir calls in flight, which pays off on high-latency
+        filesystems (e.g. network mounts). Symlinks and directories for which
+        `prune` returns True are skipped. `tops` must not be empty. Errors other
+        than unreadable directories are raised here, as in the serial walk.
+        """
+        pending: queue.LifoQueue[t.Optional[str]] = queue.LifoQueue()
+        results: queue.Queue[t.Union[t.List[str], Exception, None]] = queue.Queue()
+        lock = threading.Lock()
+        outstanding = len(tops)
+
+        def worker() -> None:
+            nonlocal outstanding
+            for path in iter(pending.get, None):
+                batch: t.List[str] = []
+                try:
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            if entry.is_file(follow_symlinks=False):
+                                batch.append(entry.path)
+                            elif entry.is_dir(follow_symlinks=False):
+                                if prune is not None and prune(entry.path):
+                                    continue
+                                with lock:
+                                    outstanding += 1
+                                pending.put(entry.path)
+                except OSError as e:
+                    logger.error("Could not read: %s: %s", path, e)
+                except Exception as e:
+                    results.put(e)
+                    return
+                finally:
+                    results.put(batch)
+                    with lock:
+                        outstanding -= 1
+                        if outstanding == 0:
+                            results.put(None)
+
+        files: t.List[str] = []
+        for top in tops:
+            pending.put(top)
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for _ in range(threads):
+                executor.submit(worker)
+
+            batches: t.Iterator[t.Union[t.List[str], Exception]]
+            batches = iter(results.get, None)
+            try:
+                for batch in batches:
+                    if isinstance(batch, Exception):
+                        raise batch
+                    files.extend(batch)
+            finally:
+                for _ in range(threads):
+                    pending.put(None)
+
+        return files
+
+    @staticmethod
+    def _resolve(value: Path) -> str:
+        """Resolve a path, caching the result by its absolute form.
+
+        The path is not normalized: `..` must be applied after resolving the
+        symlinks before it, as Path.resolve() does.
+        """
+        return _resolve_cached(os.path.join(os.getcwd(), value))
+
+    @staticmethod
+    def clear_resolve_cache() -> None:
+        """Clear the cache of resolved paths.
+
+        Resolved paths are cached across calls to add() and remove(). Callers
+        that create, remove or change symlinks in between should call this.
+        """
+        _resolve_cached.cache_clear()
+
+    @staticmethod
+    def _stat_mode(path: str) -> int:
+        """Mode of a path, following symlinks. 0 if it cannot be stat'ed.
+
+        A single stat answers both the file and the directory checks.
+        """
+        try:
+            return os.stat(path).st_mode
+        except (OSError, ValueError):
+            return 0
+
+    def _is_under_root(self, path: str) -> bool:
+        """Check if a resolved path is the root path or one of its descendants."""
+        return (path + os.sep).startswith(self._root_str)
 
     def add(self, *values: Path) -> None:
         """Add multiple Path objects to the context.
@@ -56,41 +441,53 @@ class Context:
         Args:
             values (Path, ...): Paths to add to the context.
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        ignoring = self._compiled_ignore is not None
+        prune = (
+            self._is_ignored_dir
+            if self._ignore_re is not None and self._negative_re is None
+            else None
+        )
+
+        files: t.List[str] = []
+        directories: t.List[str] = []
         for value in values:
-            resolved_value = value.resolve()
-            if not resolved_value.is_relative_to(self.root_path):
-                error_msg = (
-                    f"Path {resolved_value} is not under the root path {self.root_path}"
+            resolved_value = self._resolve(value)
+            if not self._is_under_root(resolved_value):
+                logger.error(
+                    "Path %s is not under the root path %s",
+                    resolved_value,
+                    self.root_path,
                 )
-                logger.error(error_msg)
                 continue
 
-            if self._is_ignored(resolved_value):
-                logger.debug(f"Ignored path: {resolved_value}")
+            if ignoring and self._is_ignored(resolved_value):
+                logger.debug("Ignored path: %s", resolved_value)
                 continue
 
-            if resolved_value.is_file():
-                if resolved_value not in self._included:
-                    self._included.add(resolved_value)
-                    logger.debug(f"File added: {resolved_value}")
-
-            elif resolved_value.is_dir():
-                for root, _, files in os.walk(resolved_value):
-                    for file in files:
-                        resolved_value = (Path(root) / file).resolve()
-
-                        if not resolved_value.is_relative_to(self.root_path):
-                            error_msg = f"Path {resolved_value} is not under the root path {self.root_path}"
-                            logger.error(error_msg)
-                            continue
-
-                        if self._is_ignored(resolved_value):
-                            logger.debug(f"Ignored path: {resolved_value}")
-                            continue
+            mode = self._stat_mode(resolved_value)
+            if stat.S_ISREG(mode):
+                files.append(resolved_value)
+            elif stat.S_ISDIR(mode):
+                directories.append(resolved_value)
+
+        # All directories are walked together, and their files filtered at once.
+        # The walk starts from already resolved directories and does not follow
+        # symlinks, so the walked paths need no further resolving.
+        if directories:
+            if self.threads > 1:
+                walked = self._parallel_walk(directories, self.threads, prune)
+            else:
+                walked = self._scandir_recursive(directories, prune)
+            files.extend(self._filter_ignored(walked))
 
-                        if resolved_value not in self._included:
-                            self._included.add(resolved_value)
-                            logger.debug(f"File added: {resolved_value}")
+        added = set(files).difference(self._included)
+        if added:
+            self._included.update(added)
+            self._sorted_included = None
+            if debug:
+                for path in added:
+                    logger.debug("File added: %s", path)
 
     def remove(self, *values: Path) -> None:
         """Remove a Path object from the context.
@@ -99,89 +496,155 @@ class Context:
             values (Path, ...): Paths to remove from the context.
         """
         for value in values:
-            resolved_value = value.resolve()
+            resolved_value = self._resolve(value)
+
+            # The sorted view, when there is one, is kept up to date: it locates
+            # the files to remove by bisection instead of scanning them all.
+            sorted_paths = self._sorted_included
 
-            if resolved_value.is_file():
+            mode = self._stat_mode(resolved_value)
+            if stat.S_ISREG(mode):
                 if resolved_value in self._included:
                     self._included.remove(resolved_value)
-                    logger.debug(f"File removed: {resolved_value}")
-            elif resolved_value.is_dir():
-                self._included = {
-                    file
-                    for file in self._included
-                    if not file.is_relative_to(resolved_value)
-                }
-                logger.debug(f"Directory removed and its files: {resolved_value}")
+                    if sorted_paths is not None:
+                        del sorted_paths[self._bisect_sorted(resolved_value)]
+                    logger.debug("File removed: %s", resolved_value)
+            elif stat.S_ISDIR(mode):
+                prefix = resolved_value.rstrip(os.sep) + os.sep
+                if sorted_paths is not None:
+                    start = end = self._bisect_sorted(prefix)
+                    count = len(sorted_paths)
+                    while end < count and sorted_paths[end].startswith(prefix):
+                        end += 1
+                    removed = sorted_paths[start:end]
+                    del sorted_paths[start:end]
+                else:
+                    removed = [
+                        file for file in self._included if file.startswith(prefix)
+                    ]
+                self._included.difference_update(removed)
+                logger.debug("Directory removed and its files: %s", resolved_value)
 
     def drop(self) -> None:
         self._included = set()
+        self._sorted_included = None
+
+    @property
+    def included(self) -> t.FrozenSet[Path]:
+        """Files in the context.
+
+        Paths are kept as strings internally; Path objects are only built here.
+        """
+        return frozenset(map(Path, self._included))
+
+    def _sorted(self) -> t.List[str]:
+        """Sort the included paths component-wise, as Path objects would be.
+
+        The result is kept until the included paths change.
+        """
+        if self._sorted_included is None:
+            self._sorted_included = sorted(
+                self._included, key=lambda p: p.split(os.sep)
+            )
+        return self._sorted_included
+
+    def _bisect_sorted(self, path: str) -> int:
+        """Index of the first path in the sorted view not sorting before `path`."""
+        paths = self._sorted()
+        key = path.split(os.sep)
+        low, high = 0, len(paths)
+        while low < high:
+            middle = (low + high) // 2
+            if paths[middle].split(os.sep) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
 
     def list(self, relative: bool = True) -> str:
         """List all Path objects in the context."""
-        return "\n".join(
-            [
-                str(
-                    p.absolute()
-                    if not relative
-                    else p.absolute().relative_to(self.root_path)
-                )
-                for p in sorted(self._included)
-            ]
-        )
+        paths = self._sorted()
+        if not relative:
+            return "\n".join(paths)
+
+        root_len = self._root_len
+        return "\n".join([path[root_len:] for path in paths])
 
     def tree(self) -> str:
-        tree: t.Dict[str, t.Any] = {}
-        for path in [
-            path.absolute().relative_to(self.root_path) for path in self._included
-        ]:
-            self._add_path_to_tree(tree, path.parts)
+        root_len = self._root_len
+        paths = [tuple(path[root_len:].split(os.sep)) for path in self._sorted()]
 
-        if not tree:
+        if not paths:
             return ""
 
-        return f".\n{self._build_tree_string(tree)}\n"
-
-    def _add_path_to_tree(
-        self,
-        tree: t.Dict[str, t.Any],
-        parts: t.Tuple[str, ...],
-    ) -> None:
-        if len(parts) == 1:
-            tree[parts[0]] = None
-        else:
-            if parts[0] not in tree:
-                tree[parts[0]] = {}
-            self._add_path_to_tree(tree[parts[0]], parts[1:])
+        # For each path, whether the node at each depth is followed by a sibling.
+        # Built backwards: a node inherits the answer of the next path while both
+        # share it, and has a sibling when the next path diverges at its depth.
+        siblings: t.List[t.List[bool]] = []
+        following: t.List[bool] = []
+        next_path: t.Optional[t.Tuple[str, ...]] = None
+        for path in reversed(paths):
+            if next_path is None:
+                following = [False] * len(path)
+            else:
+                common = self._common_prefix_len(path, next_path)
+                following = [
+                    following[depth] if depth < common else depth == common
+                    for depth in range(len(path))
+                ]
+            siblings.append(following)
+            next_path = path
+        siblings.reverse()
+
+        # prefixes[depth] is the indentation of the lines at that depth, kept
+        # for the ancestors shared with the previous path.
+        lines = ["."]
+        prefixes = [""]
+        previous: t.Tuple[str, ...] = ()
+        for path, has_sibling in zip(paths, siblings):
+            common = self._common_prefix_len(previous, path)
+            keep = common + 1
+            del prefixes[keep:]
+            for depth in range(common, len(path)):
+                prefix = prefixes[depth]
+                if has_sibling[depth]:
+                    lines.append(f"{prefix}├── {path[depth]}")
+                    prefixes.append(f"{prefix}│   ")
+                else:
+                    lines.append(f"{prefix}└── {path[depth]}")
+                    prefixes.append(f"{prefix}    ")
+            previous = path
+
+        return "\n".join(lines) + "\n"
 
-    def _build_tree_string(
-        self,
-        tree: t.Dict[str, t.Any],
-        prefix: str = "",
-    ) -> str:
-        result = []
-        keys = sorted(tree.keys())
-
-        for i, key in enumerate(keys):
-            subtree = tree[key]
-            connector = "└── " if i == len(keys) - 1 else "├── "
-            result.append(f"{prefix}{connector}{key}")
-            if subtree is not None:
-                extension = "    " if i == len(keys) - 1 else "│   "
-                result.append(self._build_tree_string(subtree, prefix + extension))
-
-        return "\n".join(result)
+    @staticmethod
+    def _common_prefix_len(a: t.Tuple[str, ...], b: t.Tuple[str, ...]) -> int:
+        length = 0
+        for x, y in zip(a, b):
+            if x != y:
+                break
+            length += 1
+        return length
 
     def generate(self) -> str:
         if not self._included:
             logger.debug("No files in the context")
             return ""
 
-        def wrap_code(file: Path) -> str:
+        root_len = self._root_len
+
+        def wrap_code(file: str) -> str:
+            # Same extension as Path.suffix, without building a Path per file.
+            stem, _, extension = file.rpartition(os.sep)[2].rpartition(".")
+            if not stem:
+                extension = ""
+            with open(file) as f:
+                text = f.read()
             return "\n".join(
                 [
-                    f"### `{file.absolute().relative_to(self.root_path)}`",
-                    f"````{file.suffix[1:] if file.suffix else ''}",
-                    f"{file.read_text()}",
+                    f"### `{file[root_len:]}`",
+                    f"````{extension}",
+                    text,
                     "````\n",
                 ]
             )
@@ -191,11 +654,11 @@ class Context:
             f"````\n{self.tree()}````\n" "",
         ]
 
-        for path in sorted(self._included):
+        for path in self._sorted():
             try:
                 content.append(wrap_code(path))
             except UnicodeDecodeError as e:
-                logger.error(f"Could not read: {path}: {e}")
+                logger.error("Could not read: %s: %s", path, e)
 
         return "\n".join(content)
 
@@ -222,7 +685,7 @@ class Context:
                 "ignore": [
                     f"{'str' if isinstance(i, str) else 'path'}::{i}" for i in ignore
                 ],
-                "files": list(map(str, sorted(self._included))),
+                "files": self._sorted(),
             },
             indent=4,
         )
@@ -1,6 +1,7 @@
 import json
 import os
 import shutil
+import tempfile
 import typing as t
 import unittest
 from contextlib import contextmanager
@@ -24,24 +25,7 @@ from llm_context_generator.cli import (
 TESTS_DIR = Path(__file__).parent
 FIXTURES_DIR = TESTS_DIR / "fixtures"
 
-
-@contextmanager
-def initiated_context() -> t.Tuple[Context, Path]:
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        init_result = runner.invoke(init)
-        assert init_result.exit_code == 0
-        yield runner, Path.cwd()
-
-
-class TestCli(unittest.TestCase):
-
-    def test_no_args(self):
-        runner = CliRunner()
-        result = runner.invoke(cli)
-        self.assertEqual(0, result.exit_code)
-        self.assertEqual(
-            """Usage: cli [OPTIONS] COMMAND [ARGS]...
+EXPECTED_HELP = """Usage: cli [OPTIONS] COMMAND [ARGS]...
 
   LLM Context Generator.
 
@@ -58,67 +42,116 @@ Commands:
   list      List what is included in the context.
   tree      List what is included in the context as a tree.
   generate  Generate the context output.
-""",
-            result.output,
+"""
+
+
+@contextmanager
+def initiated_context(
+    runner: CliRunner, temp_dir: Path
+) -> t.Iterator[t.Tuple[CliRunner, Path]]:
+    # Write the same metadata as the init command without going through click;
+    # test_init and test_init_already_done cover the command itself.
+    with runner.isolated_filesystem(temp_dir=temp_dir):
+        root = Path.cwd()
+        context = Context(
+            root_path=root,
+            ignore=[
+                Path.home() / ".gitignore",
+                root / ".gitignore",
+                ".git",
+                ".ctx",
+            ],
         )
+        (root / ".ctx").mkdir()
+        (root / ".ctx" / "ctx.json").write_text(context.to_json())
+        yield runner, root
 
-    def test_help(self):
-        runner = CliRunner()
-        result = runner.invoke(cli, ["--help"])
-        self.assertEqual(0, result.exit_code)
-        self.assertEqual(
-            """Usage: cli [OPTIONS] COMMAND [ARGS]...
 
-  LLM Context Generator.
+def _read_ctx(root: Path) -> t.Dict[str, t.Any]:
+    return json.loads((root / ".ctx" / "ctx.json").read_bytes())
 
-Options:
-  -v, --version  Show the version and exit.
-  -h, --help     Show this message and exit.
 
-Commands:
-  init      Initialize a context.
-  destroy   Remove the context.
-  add       Add files to the context. Run add --help to see more.
-  remove    Remove files from the context. Run remove --help to see more.
-  reset     Reset the context removing all files.
-  list      List what is included in the context.
-  tree      List what is included in the context as a tree.
-  generate  Generate the context output.
-""",
-            result.output,
+def _expected_ignore(root: Path) -> t.List[str]:
+    return [
+        f"path::{Path.home() / '.gitignore'}",
+        f"path::{root / '.gitignore'}",
+        "str::.git",
+        "str::.ctx",
+    ]
+
+
+class TestCli(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.runner = CliRunner()
+
+        # Isolated filesystems are created under one directory, removed once
+        # the class is done.
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.temp_dir)
+
+        # Copy the fixtures once; tests hard link them from this staged tree,
+        # which lives on the same filesystem as their isolated directories.
+        cls.staged_fixtures = cls.temp_dir / "fixtures"
+        shutil.copytree(FIXTURES_DIR, cls.staged_fixtures)
+
+    def _stage_fixtures(self, root: Path) -> None:
+        # Symlinks would not do: the context resolves them to the staged tree,
+        # which is outside root. Copy where hard links are not supported.
+        def link_or_copy(src: str, dst: str) -> None:
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+        shutil.copytree(
+            self.staged_fixtures, root, copy_function=link_or_copy, dirs_exist_ok=True
         )
 
+    def setUp(self):
+        # Some tests change directory; keep that from leaking into other tests
+        # running on the same worker.
+        self.addCleanup(os.chdir, os.getcwd())
+
+    def test_no_args(self):
+        result = self.runner.invoke(cli)
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(EXPECTED_HELP, result.output)
+
+    def test_help(self):
+        result = self.runner.invoke(cli, ["--help"])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(EXPECTED_HELP, result.output)
+
     def test_version(self):
-        runner = CliRunner()
-        result = runner.invoke(cli, ["-v"])
+        result = self.runner.invoke(cli, ["-v"])
         self.assertEqual(0, result.exit_code)
         self.assertEqual(f"{__version__}\n", result.output)
 
     def test_init(self):
-        with initiated_context() as (runner, root):
+        with self.runner.isolated_filesystem(temp_dir=self.temp_dir):
+            result = self.runner.invoke(init)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual("Context initialized.\n", result.output)
+
+            root = Path.cwd()
             expected_ctx_json = {
-                "root": str(Path.cwd()),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(Path.cwd() / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "root": str(root),
+                "ignore": _expected_ignore(root),
                 "files": [],
             }
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
     def test_init_already_done(self):
-        with initiated_context() as (runner, root):
+        with self.runner.isolated_filesystem(temp_dir=self.temp_dir):
+            self.assertEqual(self.runner.invoke(init).exit_code, 0)
 
             # init again
-            result = runner.invoke(init)
+            result = self.runner.invoke(init)
 
             self.assertEqual(result.exit_code, 0)
             self.assertEqual(
@@ -126,27 +159,17 @@ Commands:
                 result.output,
             )
 
-            (root / "subdir1" / "subdir2").mkdir(parents=True)
-            os.chdir(root / "subdir1" / "subdir2")
-
     def test_destroy(self):
-        with initiated_context() as (runner, root):
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
             expected_ctx_json = {
-                "root": str(Path.cwd()),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(Path.cwd() / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "root": str(root),
+                "ignore": _expected_ignore(root),
                 "files": [],
             }
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
             result = runner.invoke(destroy)
@@ -157,7 +180,6 @@ Commands:
             self.assertFalse((root / ".ctx").exists())
 
     def test_commands_without_initiated_context(self):
-        runner = CliRunner()
 
         commands = [
             (destroy, None),
@@ -170,7 +192,7 @@ Commands:
         ]
 
         for command, args in commands:
-            result = runner.invoke(command, args)
+            result = self.runner.invoke(command, args)
             self.assertEqual(-1, result.exit_code)
             self.assertEqual(
                 "Context not found. Please initialize with the init command.\n",
@@ -178,7 +200,7 @@ Commands:
             )
 
     def test_context_metadata_not_found(self):
-        with initiated_context() as (runner, root):
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
             # something happened and the file is not there
             (root / ".ctx" / "ctx.json").unlink()
 
@@ -191,20 +213,20 @@ Commands:
             )
 
     def test_add_with_no_args(self):
-        with initiated_context() as (runner, root):
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
             result = runner.invoke(add)
             self.assertEqual(result.exit_code, 0)  # no_args_is_help
             self.assertTrue("Usage: add [OPTIONS] [FILES...]" in result.output)
 
     def test_remove_with_no_args(self):
-        with initiated_context() as (runner, root):
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
             result = runner.invoke(remove)
             self.assertEqual(result.exit_code, 0)  # no_args_is_help
             self.assertTrue("Usage: remove [OPTIONS] [FILES...]" in result.output)
 
     def test_add(self):
-        with initiated_context() as (runner, root):
-            shutil.copytree(FIXTURES_DIR, root, dirs_exist_ok=True)
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
+            self._stage_fixtures(root)
 
             result = runner.invoke(
                 add,
@@ -228,12 +250,7 @@ Commands:
 
             expected_ctx_json = {
                 "root": str(root),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(root / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "ignore": _expected_ignore(root),
                 "files": [
                     str(root / "b" / "hello.bash"),
                     str(root / "b" / "hello.bat"),
@@ -247,14 +264,12 @@ Commands:
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
     def test_remove(self):
-        with initiated_context() as (runner, root):
-            shutil.copytree(FIXTURES_DIR, root, dirs_exist_ok=True)
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
+            self._stage_fixtures(root)
 
             # add
             runner.invoke(
@@ -268,12 +283,7 @@ Commands:
 
             expected_ctx_json = {
                 "root": str(root),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(root / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "ignore": _expected_ignore(root),
                 "files": [
                     str(root / "b" / "hello.bash"),
                     str(root / "b" / "hello.bat"),
@@ -286,9 +296,7 @@ Commands:
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
             # remove
@@ -315,12 +323,7 @@ Commands:
 
             expected_ctx_json = {
                 "root": str(root),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(root / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "ignore": _expected_ignore(root),
                 "files": [
                     str(root / "b" / "hello.bat"),
                 ],
@@ -328,14 +331,12 @@ Commands:
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
     def test_reset(self):
-        with initiated_context() as (runner, root):
-            shutil.copytree(FIXTURES_DIR, root, dirs_exist_ok=True)
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
+            self._stage_fixtures(root)
 
             # add
             runner.invoke(
@@ -348,12 +349,7 @@ Commands:
 
             expected_ctx_json = {
                 "root": str(root),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(root / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "ignore": _expected_ignore(root),
                 "files": [
                     str(root / "p" / "hello.php"),
                     str(root / "p" / "hello.pl"),
@@ -364,9 +360,7 @@ Commands:
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
             # reset
@@ -377,25 +371,18 @@ Commands:
 
             expected_ctx_json = {
                 "root": str(root),
-                "ignore": [
-                    f"path::{(Path.home() / '.gitignore')}",
-                    f"path::{(root / '.gitignore')}",
-                    "str::.git",
-                    "str::.ctx",
-                ],
+                "ignore": _expected_ignore(root),
                 "files": [],
             }
 
             self.assertEqual(
                 expected_ctx_json,
-                json.loads(
-                    (root / ".ctx" / "ctx.json").read_text(),
-                ),
+                _read_ctx(root),
             )
 
     def test_list(self):
-        with initiated_context() as (runner, root):
-            shutil.copytree(FIXTURES_DIR, root, dirs_exist_ok=True)
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
+            self._stage_fixtures(root)
 
             # add / remove
             runner.invoke(add, ["."])
@@ -423,8 +410,8 @@ symlink-to-hello.html
             )
 
     def test_tree(self):
-        with initiated_context() as (runner, root):
-            shutil.copytree(FIXTURES_DIR, root, dirs_exist_ok=True)
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
+            self._stage_fixtures(root)
 
             # add / remove
             runner.invoke(add, ["."])
@@ -456,8 +443,8 @@ symlink-to-hello.html
             )
 
     def test_generate(self):
-        with initiated_context() as (runner, root):
-            shutil.copytree(FIXTURES_DIR, root, dirs_exist_ok=True)
+        with initiated_context(self.runner, self.temp_dir) as (runner, root):
+            self._stage_fixtures(root)
 
             # add / remove
             runner.invoke(add, ["about.txt", "p"])